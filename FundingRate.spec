@@ -29,12 +29,13 @@ a = Analysis(
         'uvicorn',
         'fastapi',
         'httpx',
+        'h2',
         'starlette',
     ],
     hookspath=[os.path.join(spec_dir, 'hooks')],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['pandas'],  # кэш Parquet пишется через pyarrow напрямую
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -1,43 +1,57 @@
 """
 Общее состояние API: кэш фандинга и символ.
 Вынесено в отдельный модуль, чтобы избежать циклического импорта main <-> routers.funding.
+Символ нормализуется один раз на входе (router, set_requested_symbol); остальные функции
+принимают уже нормализованный ключ (верхний регистр, без пробелов).
 """
 from __future__ import annotations
 
+import json
+import re
 import time
 from typing import Any
 
 from config import DEFAULT_SYMBOL
 
-_funding_cache: dict[str, dict[str, dict[str, Any]]] = {}
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Снимок кэша: символ -> (данные, те же данные в JSON, время обновления по time.monotonic_ns()).
+# Запись не меняет словарь на месте, а подменяет его целиком (copy-on-write), поэтому
+# читатель одним обращением получает согласованную тройку без блокировок.
+_snapshot: dict[str, tuple[dict[str, dict[str, Any]], bytes, int]] = {}
 _cache_symbol: str = DEFAULT_SYMBOL
-_last_fetch_ms: dict[str, int] = {}
+
+_SYMBOL_RE = re.compile(r"[A-Z0-9-]+")
 
 
 def set_requested_symbol(symbol: str) -> None:
     """Установить символ для следующего обновления (вызывается из API)."""
     global _cache_symbol
     s = symbol.upper().strip()
-    if s and all(c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-" for c in s):
+    if _SYMBOL_RE.fullmatch(s):
         _cache_symbol = s
 
 
-def get_cached_funding(symbol: str) -> dict[str, Any]:
-    """Вернуть кэш фандинга по символу."""
-    symbol = symbol.upper().strip()
-    if symbol in _funding_cache:
-        return _funding_cache[symbol]
-    if _funding_cache:
-        return _funding_cache.get(_cache_symbol, _funding_cache[next(iter(_funding_cache))])
-    return {"binance": {}, "bybit": {}, "okx": {}}
+def get_cache_entry(symbol: str) -> tuple[dict[str, dict[str, Any]], bytes, int] | None:
+    """Вернуть (данные, JSON в bytes, время обновления в нс по монотонным часам) по символу или None."""
+    return _snapshot.get(symbol)
 
 
-def has_cached(symbol: str) -> bool:
-    return symbol.upper().strip() in _funding_cache
+def get_cached_funding_bytes(symbol: str) -> bytes | None:
+    """Вернуть кэш фандинга по символу в виде готового JSON (bytes) или None."""
+    entry = _snapshot.get(symbol)
+    return entry[1] if entry is not None else None
 
 
-def get_last_fetch_ms(symbol: str) -> int:
-    return _last_fetch_ms.get(symbol.upper().strip(), 0)
+def encode_json(data: Any) -> bytes:
+    """Сериализовать в компактный JSON (bytes): orjson, если установлен, иначе json."""
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 
 def get_cache_symbol() -> str:
@@ -47,7 +61,6 @@ def get_cache_symbol() -> str:
 
 def set_funding_cache(symbol: str, data: dict[str, dict[str, Any]]) -> None:
     """Записать результат обновления в кэш (вызывается из main._refresh_loop)."""
-    global _funding_cache, _last_fetch_ms
-    s = symbol.upper().strip()
-    _funding_cache[s] = data
-    _last_fetch_ms[s] = int(time.time() * 1000)
+    global _snapshot
+    entry = (data, encode_json(data), time.monotonic_ns())
+    _snapshot = {**_snapshot, symbol: entry}
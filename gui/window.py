@@ -4,39 +4,54 @@ Symbol input: uppercase Latin only, layout-independent (keycode-based).
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import os
+import re
 import threading
 import time
-from datetime import datetime, timezone
-from tkinter import Tk, ttk, StringVar, Label, Entry, Frame, Button, Listbox, Scrollbar
-from typing import Any
+from tkinter import Tk, StringVar, Label, Entry, Frame, Button, Listbox, Scrollbar
+from typing import Any, Callable, Coroutine
 
-import urllib.request
+import httpx
 
 from config import API_HOST, API_PORT, DEFAULT_SYMBOL, PARQUET_DIR
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 STATE_FILE = os.path.join(os.path.dirname(PARQUET_DIR), "window_state.json")
+API_BASE_URL = f"http://{API_HOST}:{API_PORT}"
+# История меняется только после очередного фандинга: держим её в памяти до следующего
+# фандинга биржи, но не дольше HISTORY_CACHE_TTL_MS
+HISTORY_CACHE_TTL_MS = 5 * 60 * 1000
+
+# Биржи в порядке отображения и их подписи в заголовках
+_EXCHANGES: tuple[str, ...] = ("binance", "bybit", "okx")
+_DISPLAY: dict[str, str] = {"binance": "BINANCE", "bybit": "BYBIT", "okx": "OKX"}
+
+# Допустимые символы пары: латиница верхнего регистра, цифры, дефис
+_SYMBOL_RE = re.compile(r"[A-Z0-9-]+")
+_SYMBOL_STRIP_RE = re.compile(r"[^A-Z0-9-]+")
 
 # Windows virtual key codes: digits 0-9, letters A-Z, hyphen
 # So input is always Latin uppercase regardless of keyboard layout
-VK_DIGITS = set(range(0x30, 0x3A))  # 48-57
-VK_LETTERS = set(range(0x41, 0x5B))  # 65-90
+VK_DIGITS = range(0x30, 0x3A)  # 48-57
+VK_LETTERS = range(0x41, 0x5B)  # 65-90
 VK_HYPHEN = 0xBD  # 189, VK_OEM_MINUS
 VK_BACK = 0x08
 VK_DELETE = 0x2E
-VK_ALLOWED = VK_DIGITS | VK_LETTERS | {VK_HYPHEN, VK_BACK, VK_DELETE}
-
 
-def keycode_to_char(keycode: int) -> str | None:
-    """Map Windows keycode to allowed character (uppercase Latin or digit or hyphen)."""
-    if keycode in VK_DIGITS:
-        return chr(keycode)
-    if keycode in VK_LETTERS:
-        return chr(keycode)
-    if keycode == VK_HYPHEN:
-        return "-"
-    return None
+# keycode -> допустимый символ (None — клавиша не вводит символ): одна индексация на нажатие
+_KC_TO_CHAR: list[str | None] = [None] * 256
+for _kc in (*VK_DIGITS, *VK_LETTERS):
+    _KC_TO_CHAR[_kc] = chr(_kc)
+_KC_TO_CHAR[VK_HYPHEN] = "-"
+del _kc
 
 
 def on_symbol_keypress(event) -> str:
@@ -53,7 +68,7 @@ def on_symbol_keypress(event) -> str:
             clip = root.clipboard_get()
         except Exception:
             clip = ""
-        s = "".join(c for c in (clip or "").upper() if c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-")
+        s = _SYMBOL_STRIP_RE.sub("", (clip or "").upper())
         try:
             if widget.selection_present():
                 widget.delete("sel.first", "sel.last")
@@ -61,11 +76,9 @@ def on_symbol_keypress(event) -> str:
         except Exception:
             pass
         return "break"
-    if keycode not in VK_ALLOWED:
-        return "break"
     if keycode == VK_BACK or keycode == VK_DELETE:
         return None  # allow default
-    char = keycode_to_char(keycode)
+    char = _KC_TO_CHAR[keycode] if 0 <= keycode < 256 else None
     if char is None:
         return "break"
     try:
@@ -81,6 +94,7 @@ def on_symbol_keypress(event) -> str:
         return "break"
 
 
+@functools.lru_cache(maxsize=256)
 def symbol_to_pair(symbol: str) -> str:
     """ZIL -> ZILUSDT, BTC -> BTCUSDT; если уже оканчивается на USDT — без изменений."""
     s = symbol.upper().strip()
@@ -91,72 +105,93 @@ def symbol_to_pair(symbol: str) -> str:
     return s + "USDT"
 
 
-def fetch_funding(symbol: str) -> dict[str, Any]:
+def _loads(raw: bytes) -> Any:
+    """Разобрать JSON из байтов ответа: orjson, если установлен; json.loads принимает bytes без decode()."""
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+async def fetch_funding(client: httpx.AsyncClient, symbol: str) -> dict[str, Any]:
     """GET /api/funding?symbol=..."""
     symbol = symbol_to_pair(symbol.upper().strip())
-    url = f"http://{API_HOST}:{API_PORT}/api/funding?symbol={symbol}"
     try:
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            return json.loads(resp.read().decode())
+        r = await client.get(f"{API_BASE_URL}/api/funding", params={"symbol": symbol}, timeout=5.0)
+        r.raise_for_status()
+        return _loads(r.content)
     except Exception as e:
         return {"error": str(e)}
 
 
-def fetch_funding_history(symbol: str) -> dict[str, Any]:
+async def fetch_funding_history(client: httpx.AsyncClient, symbol: str) -> dict[str, Any]:
     """GET /api/funding-history?symbol=... Возвращает { binance: [...], bybit: [...], okx: [...] }."""
     symbol = symbol_to_pair(symbol.upper().strip())
-    url = f"http://{API_HOST}:{API_PORT}/api/funding-history?symbol={symbol}"
     try:
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            return json.loads(resp.read().decode())
+        r = await client.get(f"{API_BASE_URL}/api/funding-history", params={"symbol": symbol}, timeout=10.0)
+        r.raise_for_status()
+        return _loads(r.content)
     except Exception as e:
         return {"error": str(e)}
 
 
-def format_history_line(funding_time_ms: int, funding_rate: str) -> str:
+def format_history_line(funding_time_ms: int, funding_rate: float | str | None) -> str:
     """Одна строка для списка истории: дата/время (локальный часовой пояс) и ставка в %."""
     try:
-        dt = datetime.fromtimestamp(funding_time_ms / 1000.0)
-        s = dt.strftime("%Y-%m-%d %H:%M")
-    except Exception:
+        s = time.strftime("%Y-%m-%d %H:%M", time.localtime(funding_time_ms // 1000))
+    except (OverflowError, OSError, ValueError, TypeError):
         s = "—"
+    return f"{s}  {format_funding_rate(funding_rate)[0]}"
+
+
+def format_history_lines(items: list[dict[str, Any]]) -> list[str]:
+    """Строки для списка истории: сначала новые записи."""
+    items = sorted(items, key=lambda item: item.get("fundingTime") or 0, reverse=True)
+    return [format_history_line(item.get("fundingTime") or 0, item.get("fundingRate")) for item in items]
+
+
+async def fetch_history_lines(client: httpx.AsyncClient, symbol: str) -> dict[str, Any]:
+    """История фандингов, уже отформатированная в строки: { binance: [str, ...], ... } или { error }.
+    Сортировка и форматирование выполняются в фоновом потоке, а не в main thread Tk."""
+    data = await fetch_funding_history(client, symbol)
+    if data.get("error"):
+        return data
     try:
-        r = float(funding_rate)
-        rate_pct = f"{r * 100:.6f}%"
-    except (ValueError, TypeError):
-        rate_pct = funding_rate or "—"
-    return f"{s}  {rate_pct}"
+        return {n: format_history_lines(lst) for n, lst in data.items() if isinstance(lst, list)}
+    except Exception as e:
+        return {"error": str(e) or type(e).__name__}
 
 
-def format_funding_rate(rate_str: str) -> str:
-    """Форматировать ставку как процент: 0.0001 -> 0.01%."""
-    if not rate_str or rate_str == "—":
-        return "—"
+def format_funding_rate(rate: float | str | None) -> tuple[str, float | None]:
+    """Форматировать ставку как процент: 0.0001 -> ("0.01%", 0.0001). Число — None, если ставки нет или её не разобрать.
+    API отдаёт ставку числом (null — нет данных); строка тоже принимается."""
+    if rate is None or rate == "" or rate == "—":
+        return "—", None
     try:
-        r = float(rate_str)
-        return f"{r * 100:.6f}%"
+        r = float(rate)
+        return f"{r * 100:.6f}%", r
     except (ValueError, TypeError):
-        return rate_str
+        return str(rate), None
 
 
-def format_time_to_next(next_funding_ms: int) -> str:
+def format_time_to_next(next_funding_ms: int, now_ms: int | None = None) -> str:
     """Countdown from local time to next funding (UTC ms). Format: Xh Ym Zs."""
     if not next_funding_ms:
         return "—"
+    if now_ms is None:
+        now_ms = time.time_ns() // 1_000_000
     try:
-        next_utc = datetime.fromtimestamp(next_funding_ms / 1000.0, tz=timezone.utc)
-        now_utc = datetime.now(timezone.utc)
-        delta = next_utc - now_utc
-        if delta.total_seconds() <= 0:
-            return "0h 0m 0s"
-        total = int(delta.total_seconds())
-        h, r = divmod(total, 3600)
-        m, s = divmod(r, 60)
-        return f"{h}h {m}m {s}s"
-    except Exception:
+        total = (int(next_funding_ms) - now_ms) // 1000
+    except (ValueError, TypeError):
         return "—"
+    return _format_seconds(max(total, 0))
+
+
+@functools.lru_cache(maxsize=32768)
+def _format_seconds(total: int) -> str:
+    """Секунды -> "Xh Ym Zs". Кэш покрывает весь 8-часовой отсчёт (28800 значений)."""
+    h, r = divmod(total, 3600)
+    m, s = divmod(r, 60)
+    return f"{h}h {m}m {s}s"
 
 
 def _separator(parent: Frame) -> Frame:
@@ -180,10 +215,24 @@ class FundingWindow:
         self._exchange_labels: dict[str, dict[str, Any]] = {}  # name -> {rate, ttn, interval, ...}
         self._history_visible: dict[str, bool] = {}
         self._history_loaded_symbol: dict[str, str] = {}
+        self._last_ttn_text: dict[str, str] = {}
+        self._history_cache: dict[tuple[str, str], tuple[int, list[str]]] = {}  # (name, symbol) -> (expires_ms, lines)
         self._last_zero_refresh_at: float = 0.0
         self._rapid_poll_after_zero_id: str | None = None
+        self._refresh_inflight = False
+        self._refresh_pending_symbol: str | None = None
+        self._history_inflight: dict[str, set[str]] = {}  # symbol -> биржи, ждущие ответа
+        self._visible = True
+        self._api_poll_id: str | None = None
+        # Один фоновый поток с asyncio-циклом и общий HTTP-клиент (keep-alive) вместо потока на каждый запрос
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self._aio_client = httpx.AsyncClient()
         self._build_ui()
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.bind("<Configure>", self._on_configure)
+        self.root.bind("<Map>", self._on_map)
+        self.root.bind("<Unmap>", self._on_unmap)
         self._start_timers()
 
     def _load_state(self) -> None:
@@ -197,17 +246,25 @@ class FundingWindow:
                 x = state.get("x")
                 y = state.get("y")
                 sym = (state.get("symbol") or "").strip().upper()
-                if sym and all(c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-" for c in sym):
+                if _SYMBOL_RE.fullmatch(sym):
                     self.symbol_var.set(sym)
+                self._cur_w, self._cur_h = int(w), int(h)
                 if x is not None and y is not None:
                     self.root.geometry(f"{w}x{h}+{x}+{y}")
                 else:
                     self.root.geometry(f"{w}x{h}")
             else:
+                self._cur_w, self._cur_h = 480, 460
                 self.root.geometry("480x460")
         except Exception:
+            self._cur_w, self._cur_h = 480, 460
             self.root.geometry("480x460")
 
+    def _on_configure(self, event) -> None:
+        """Запомнить текущий размер окна (после изменения пользователем или программно)."""
+        if event.widget is self.root:
+            self._cur_w, self._cur_h = event.width, event.height
+
     def _save_state(self) -> None:
         """Сохранить размер, позицию окна и последнюю пару в файл. Размер/позицию берём из geometry() — так сохраняется актуальный размер после сворачивания списков."""
         try:
@@ -237,7 +294,7 @@ class FundingWindow:
         """Свернуть все раскрытые блоки Funding Rate History (чтобы сохранить размер окна со свёрнутыми списками)."""
         total_height = 0
         to_collapse = []
-        for name in ("binance", "bybit", "okx"):
+        for name in _EXCHANGES:
             if not self._history_visible.get(name, False):
                 continue
             labels = self._exchange_labels.get(name)
@@ -261,8 +318,29 @@ class FundingWindow:
         self.root.update_idletasks()
         self.root.update()
         self._save_state()
+        try:
+            asyncio.run_coroutine_threadsafe(self._aio_client.aclose(), self._loop).result(timeout=1)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
         self.root.destroy()
 
+    def _submit(self, coro: Coroutine[Any, Any, Any], on_done: Callable[[Any], None]) -> None:
+        """Выполнить корутину в фоновом asyncio-цикле; результат передать в on_done в потоке Tk."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+        def deliver(f: Any) -> None:
+            if f.cancelled():
+                return
+            # on_done вызывается всегда, даже при исключении: иначе флаги «в полёте» не сбросятся
+            try:
+                result = f.result()
+            except Exception as e:
+                result = {"error": str(e) or type(e).__name__}
+            self.root.after(0, on_done, result)
+
+        future.add_done_callback(deliver)
+
     def _build_ui(self) -> None:
         main = Frame(self.root, padx=12, pady=12, bg="#a9a9a9")
         main.pack(fill="both", expand=True)
@@ -288,8 +366,8 @@ class FundingWindow:
 
         _separator(main)
 
-        for name in ("binance", "bybit", "okx"):
-            display_name = "OKX" if name == "okx" else name.upper()
+        for name in _EXCHANGES:
+            display_name = _DISPLAY[name]
             sec = Frame(main, bg="#a9a9a9")
             sec.pack(fill="x", pady=6)
             Label(sec, text=display_name, font=("Arial", 12, "bold"), bg="#a9a9a9").pack(anchor="w")
@@ -335,22 +413,10 @@ class FundingWindow:
 
     def _resize_window_by(self, delta_height: int) -> None:
         """Изменить высоту основного окна на delta_height (положительное — увеличить)."""
+        # Размер берём из _cur_w/_cur_h (обновляются по <Configure>); geometry без "+X+Y" позицию не меняет
         try:
-            geom = self.root.geometry()
-            # Формат: "WxH" или "WxH+X+Y"
-            if "+" in geom:
-                part, pos = geom.split("+", 1)
-                x, y = pos.split("+", 1)
-            else:
-                part = geom
-                x = y = None
-            if "x" in part:
-                w, h = part.split("x", 1)
-                new_h = max(self.root.minsize()[1], int(h) + delta_height)
-                if x is not None and y is not None:
-                    self.root.geometry(f"{w}x{new_h}+{x}+{y}")
-                else:
-                    self.root.geometry(f"{w}x{new_h}")
+            self._cur_h = max(self.root.minsize()[1], self._cur_h + delta_height)
+            self.root.geometry(f"{self._cur_w}x{self._cur_h}")
         except Exception:
             pass
 
@@ -393,12 +459,37 @@ class FundingWindow:
         symbol = (self.symbol_var.get() or "").upper().strip()
         if not symbol:
             return
-
-        def do():
-            data = fetch_funding_history(symbol)
-            self.root.after(0, lambda: self._fill_history_listbox(name, symbol, data))
-
-        threading.Thread(target=do, daemon=True).start()
+        cached = self._history_cache.get((name, symbol))
+        if cached and time.time_ns() // 1_000_000 < cached[0]:
+            if self._history_loaded_symbol.get(name) != symbol:
+                self._fill_history_listbox(name, symbol, {name: cached[1]})
+            return
+        # Один ответ содержит историю всех бирж: пока запрос по символу в полёте, лишь добавляем биржу в ожидающие
+        waiting = self._history_inflight.get(symbol)
+        if waiting is not None:
+            waiting.add(name)
+            return
+        self._history_inflight[symbol] = {name}
+        self._submit(
+            fetch_history_lines(self._aio_client, symbol),
+            lambda data: self._on_history(symbol, data),
+        )
+
+    def _on_history(self, symbol: str, data: dict[str, Any]) -> None:
+        """Готовые строки истории всех бирж: закэшировать и заполнить ожидающие списки."""
+        names = self._history_inflight.pop(symbol, set())
+        if not data.get("error"):
+            now_ms = time.time_ns() // 1_000_000
+            for n, lines in data.items():
+                if not lines:
+                    continue  # пустой список — скорее сбой биржи, не кэшируем
+                expires_ms = now_ms + HISTORY_CACHE_TTL_MS
+                next_ms = self.next_funding_ms.get(n) or 0
+                if now_ms < next_ms < expires_ms:
+                    expires_ms = next_ms
+                self._history_cache[(n, symbol)] = (expires_ms, lines)
+        for name in names:
+            self._fill_history_listbox(name, symbol, data)
 
     def _fill_history_listbox(self, name: str, symbol: str, data: dict[str, Any]) -> None:
         """Заполнить Listbox истории для биржи (вызывать из main thread). Позицию прокрутки сохраняем."""
@@ -418,13 +509,10 @@ class FundingWindow:
             listbox.insert("end", f"Error: {data['error']}")
             self._history_loaded_symbol[name] = symbol
             return
-        lst = data.get(name)
-        items = list(lst) if isinstance(lst, list) else []
-        items.sort(key=lambda x: x.get("fundingTime") or 0, reverse=True)
-        for item in items:
-            ts = item.get("fundingTime") or 0
-            rate = item.get("fundingRate") or ""
-            listbox.insert("end", format_history_line(ts, rate))
+        lines = data.get(name) or []
+        if lines:
+            # Одна вставка всех строк вместо вызова Tcl на каждую строку
+            listbox.insert("end", *lines)
         self._history_loaded_symbol[name] = symbol
         try:
             listbox.yview_moveto(min(scroll_top, 1.0))
@@ -432,7 +520,7 @@ class FundingWindow:
             pass
 
     def _normalize_symbol(self, event=None) -> None:
-        s = "".join(c for c in self.symbol_var.get().upper() if c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-")
+        s = _SYMBOL_STRIP_RE.sub("", self.symbol_var.get().upper())
         if s:
             s = symbol_to_pair(s)
         self.symbol_var.set(s)
@@ -447,70 +535,91 @@ class FundingWindow:
         if not symbol:
             self._status_label.config(text="Enter symbol (e.g. BTCUSDT)")
             return
-        def do():
-            self.data = fetch_funding(symbol)
-            self.root.after(0, self._apply_data)
-        threading.Thread(target=do, daemon=True).start()
+        # Single-flight: пока запрос в полёте, новые лишь запоминают последний символ
+        if self._refresh_inflight:
+            self._refresh_pending_symbol = symbol
+            return
+        self._refresh_inflight = True
+        self._submit(fetch_funding(self._aio_client, symbol), lambda data: self._on_funding(symbol, data))
+
+    def _on_funding(self, symbol: str, data: dict[str, Any]) -> None:
+        self._refresh_inflight = False
+        pending, self._refresh_pending_symbol = self._refresh_pending_symbol, None
+        if pending is not None and pending != symbol:
+            # Пока шёл запрос, пару сменили — ответ по старой паре не показываем, сразу запрашиваем новую
+            self._refresh()
+            return
+        self.data = data
+        self._apply_data()
 
     def _apply_data(self) -> None:
         if "error" in self.data and len(self.data) == 1:
             self._status_label.config(text=f"Status: Error — {self.data['error']}", fg="#b22222")
             return
         self._status_label.config(text="Status: Connected", fg="#228b22")
-        for name in ("binance", "bybit", "okx"):
+        for name in _EXCHANGES:
             labels = self._exchange_labels.get(name)
             if not labels:
                 continue
             row = self.data.get(name) or {}
             if isinstance(row, dict) and "error" in row:
                 labels["rate"].config(text="—", fg="black", font=("Arial", 11, "bold"))
-                labels["ttn"].config(text="—")
+                self._set_ttn(name, "—")
                 labels["interval"].config(text="—")
                 self.next_funding_ms[name] = 0
             else:
-                rate = format_funding_rate(row.get("fundingRate", "") or "")
+                # Ставка разбирается один раз: и для текста, и для цвета
+                rate, r = format_funding_rate(row.get("fundingRate"))
                 next_ms = row.get("nextFundingTimeMs") or 0
                 self.next_funding_ms[name] = next_ms
                 ttn = format_time_to_next(next_ms)
                 interval = row.get("interval", "—") or "—"
-                labels["rate"].config(text=rate, font=("Arial", 11, "bold"))
-                try:
-                    r = float(row.get("fundingRate") or 0)
-                    labels["rate"].config(fg="#427b20" if r >= 0 else "#be122a")
-                except (ValueError, TypeError):
-                    labels["rate"].config(fg="black")
-                labels["ttn"].config(text=ttn)
+                if r is None:
+                    fg = "black"
+                else:
+                    fg = "#427b20" if r >= 0 else "#be122a"
+                labels["rate"].config(text=rate, fg=fg, font=("Arial", 11, "bold"))
+                self._set_ttn(name, ttn)
                 labels["interval"].config(text=interval)
-        if any(self.next_funding_ms.get(n) and not self._is_past_funding_time(self.next_funding_ms[n]) for n in ("binance", "bybit", "okx")):
+        if any(self.next_funding_ms.get(n) and not self._is_past_funding_time(self.next_funding_ms[n]) for n in _EXCHANGES):
             self._last_zero_refresh_at = 0.0
-        for name in ("binance", "bybit", "okx"):
+        for name in _EXCHANGES:
             if self._history_visible.get(name):
-                self._history_loaded_symbol[name] = ""
                 self._load_history_for_exchange(name)
 
     def _is_past_funding_time(self, next_ms: int) -> bool:
         """Проверить, прошло ли уже время фандинга (next_ms в прошлом)."""
         if not next_ms:
             return False
-        try:
-            next_utc = datetime.fromtimestamp(next_ms / 1000.0, tz=timezone.utc)
-            now_utc = datetime.now(timezone.utc)
-            return (next_utc - now_utc).total_seconds() <= 0
-        except Exception:
-            return False
+        # Оба значения — UTC-время эпохи, сравниваем напрямую без построения datetime
+        return next_ms <= time.time_ns() // 1_000_000
+
+    def _set_ttn(self, name: str, text: str) -> None:
+        """Обновить Time to Next, только если текст изменился (лишний configure — лишняя перерисовка Tk)."""
+        if self._last_ttn_text.get(name) == text:
+            return
+        labels = self._exchange_labels.get(name)
+        if labels:
+            labels["ttn"].config(text=text)
+            self._last_ttn_text[name] = text
 
     def _tick_countdown(self) -> None:
         """Update Time to Next every second. При достижении нуля — немедленный refresh и повтор через 5 сек."""
+        if not self._visible:
+            self.root.after(1000, self._tick_countdown)
+            return
         any_at_zero = False
-        for name in ("binance", "bybit", "okx"):
-            next_ms = self.next_funding_ms.get(name, 0)
+        # Вызывается раз в секунду: время и атрибуты экземпляра читаем один раз
+        now_ms = time.time_ns() // 1_000_000
+        next_funding_ms = self.next_funding_ms
+        set_ttn = self._set_ttn
+        for name in _EXCHANGES:
+            next_ms = next_funding_ms.get(name, 0)
             if not next_ms:
                 continue
-            if self._is_past_funding_time(next_ms):
+            if next_ms <= now_ms:
                 any_at_zero = True
-            labels = self._exchange_labels.get(name)
-            if labels:
-                labels["ttn"].config(text=format_time_to_next(next_ms))
+            set_ttn(name, format_time_to_next(next_ms, now_ms))
         if any_at_zero and (time.time() - self._last_zero_refresh_at) >= 5:
             self._last_zero_refresh_at = time.time()
             self._refresh()
@@ -524,9 +633,26 @@ class FundingWindow:
         self._refresh()
 
     def _api_poll(self) -> None:
-        """Refresh data from API every 15 seconds."""
-        self._refresh()
-        self.root.after(15_000, self._api_poll)
+        """Refresh data from API every 15 seconds; while the window is minimized — skip and check every 60 s."""
+        if self._visible:
+            self._refresh()
+            self._api_poll_id = self.root.after(15_000, self._api_poll)
+        else:
+            self._api_poll_id = self.root.after(60_000, self._api_poll)
+
+    def _on_map(self, event) -> None:
+        """Окно развернули: сразу обновить данные и вернуть обычный интервал опроса."""
+        if event.widget is not self.root or self._visible:
+            return
+        self._visible = True
+        if self._api_poll_id is not None:
+            self.root.after_cancel(self._api_poll_id)
+        self._api_poll()
+
+    def _on_unmap(self, event) -> None:
+        """Окно свернули: опрос API и обновление отсчёта приостанавливаются."""
+        if event.widget is self.root:
+            self._visible = False
 
     def _start_timers(self) -> None:
         self.root.after(1000, self._tick_countdown)
@@ -4,59 +4,98 @@ FastAPI app: funding rate API, refresh every 30s, optional Parquet cache.
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
-from typing import Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator
 
 import httpx
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+try:
+    from fastapi.responses import ORJSONResponse
+    import orjson  # noqa: F401  (ORJSONResponse требует установленный orjson)
+    _ResponseClass = ORJSONResponse
+except ImportError:
+    _ResponseClass = JSONResponse
 
 from config import REFRESH_INTERVAL_SEC
 from routers.funding import router as funding_router
-from services.exchange_fetcher import fetch_all
+from services.exchange_fetcher import create_client, fetch_all
+from storage import parquet_cache
 
 import app_state
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Funding Rate API")
-app.include_router(funding_router)
+# Один поток-писатель: записи в файл кэша идут по очереди
+_parquet_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="parquet")
 
-_http_client: httpx.AsyncClient | None = None
 
+def _write_parquet(symbol: str, data: dict[str, dict[str, Any]]) -> None:
+    """Записать строки обновления в Parquet-кэш (выполняется в _parquet_executor)."""
+    try:
+        for name, row in data.items():
+            if "error" not in row and row.get("nextFundingTimeMs"):
+                parquet_cache.write_row(
+                    name,
+                    row.get("symbol", symbol),
+                    row.get("fundingRate"),
+                    row.get("nextFundingTimeMs", 0),
+                    row.get("interval", ""),
+                )
+    except Exception as e:
+        logger.debug("Parquet write skip: %s", e)
 
-async def _refresh_loop() -> None:
-    global _http_client
-    _http_client = httpx.AsyncClient()
+
+def _close_parquet() -> None:
+    """Дописать буфер Parquet на диск (выполняется в _parquet_executor)."""
     try:
-        while True:
-            try:
-                symbol = app_state.get_cache_symbol()
-                data = await fetch_all(symbol, _http_client)
+        parquet_cache.close()
+    except Exception as e:
+        logger.debug("Parquet close skip: %s", e)
+
+
+async def _refresh_loop(client: httpx.AsyncClient) -> None:
+    while True:
+        try:
+            symbol = app_state.get_cache_symbol()
+            entry = app_state.get_cache_entry(symbol)
+            if entry is not None and time.monotonic_ns() - entry[2] < REFRESH_INTERVAL_SEC * 1_000_000_000:
+                # Роутер уже обновил этот символ по запросу — повторно к биржам не ходим
+                data = entry[0]
+            else:
+                data = await fetch_all(symbol, client)
                 app_state.set_funding_cache(symbol, data)
-                try:
-                    from storage.parquet_cache import write_row
-                    for name, row in data.items():
-                        if "error" not in row and row.get("nextFundingTimeMs"):
-                            write_row(
-                                name,
-                                row.get("symbol", symbol),
-                                row.get("fundingRate", ""),
-                                row.get("nextFundingTimeMs", 0),
-                                row.get("interval", ""),
-                            )
-                except Exception as e:
-                    logger.debug("Parquet write skip: %s", e)
-            except Exception as e:
-                logger.warning("Refresh failed: %s", e)
-            await asyncio.sleep(REFRESH_INTERVAL_SEC)
+            # Запись Parquet — блокирующий файловый I/O: выполняем в отдельном потоке, не на event loop
+            await asyncio.get_running_loop().run_in_executor(_parquet_executor, _write_parquet, symbol, data)
+        except Exception as e:
+            logger.warning("Refresh failed: %s", e)
+        await asyncio.sleep(REFRESH_INTERVAL_SEC)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Один пул соединений на всё приложение: фоновое обновление и роутеры ходят к биржам через него
+    app.state.http_client = create_client()
+    task = asyncio.create_task(_refresh_loop(app.state.http_client))
+    try:
+        yield
     finally:
-        await _http_client.aclose()
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        await app.state.http_client.aclose()
+        # Через тот же поток, что и записи: close() не пересекается с write_row()
+        await asyncio.get_running_loop().run_in_executor(_parquet_executor, _close_parquet)
+        _parquet_executor.shutdown(wait=True)
 
 
-@app.on_event("startup")
-async def startup() -> None:
-    asyncio.create_task(_refresh_loop())
+app = FastAPI(title="Funding Rate API", default_response_class=_ResponseClass, lifespan=lifespan)
+app.include_router(funding_router)
 
 
 @app.get("/")
@@ -67,4 +106,5 @@ def root() -> dict[str, str]:
 if __name__ == "__main__":
     import uvicorn
     from config import API_HOST, API_PORT
-    uvicorn.run(app, host=API_HOST, port=API_PORT)
+    # GUI опрашивает API каждые 15 с — строка access-лога на каждый запрос не нужна
+    uvicorn.run(app, host=API_HOST, port=API_PORT, access_log=False, loop="auto")
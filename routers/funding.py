@@ -3,9 +3,11 @@ Funding rate API. Returns cached data; background task refreshes every 15s.
 """
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 
-import httpx
+import functools
+import hashlib
+import re
 import time
 
 import app_state
@@ -13,9 +15,12 @@ from services.exchange_fetcher import fetch_all, fetch_all_funding_history
 
 router = APIRouter(prefix="/api", tags=["funding"])
 
-_FETCH_TTL_MS = 15_000
+_FETCH_TTL_NS = 15_000 * 1_000_000
 
+_SYMBOL_RE = re.compile(r"[A-Z0-9-]+")
 
+
+@functools.lru_cache(maxsize=256)
 def _normalize_symbol(symbol: str) -> str:
     s = symbol.upper().strip()
     # Разрешаем короткий тикер: ZIL -> ZILUSDT
@@ -25,32 +30,35 @@ def _normalize_symbol(symbol: str) -> str:
 
 
 @router.get("/funding")
-async def funding(symbol: str = Query("BTCUSDT", description="Futures pair, uppercase Latin e.g. BTCUSDT")):
+async def funding(request: Request, symbol: str = Query("BTCUSDT", description="Futures pair, uppercase Latin e.g. BTCUSDT")):
     """Return funding rate, next funding time (ms), and interval for Binance, Bybit, OKX."""
     symbol = _normalize_symbol(symbol)
-    if not symbol or not all(c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-" for c in symbol):
+    if not _SYMBOL_RE.fullmatch(symbol):
         return {"error": "Invalid symbol: only uppercase Latin letters, digits, hyphen"}
 
     app_state.set_requested_symbol(symbol)
 
-    now_ms = int(time.time() * 1000)
-    # If we have fresh cache, return immediately; otherwise fetch on-demand (no 30s wait)
-    last_ms = app_state.get_last_fetch_ms(symbol)
-    if app_state.has_cached(symbol) and (int(now_ms) - last_ms) < _FETCH_TTL_MS:
-        return app_state.get_cached_funding(symbol)
+    # If we have fresh cache, return immediately; otherwise fetch on-demand (no 30s wait).
+    # Monotonic clock: a wall-clock step (NTP) cannot make the cache look fresh forever.
+    entry = app_state.get_cache_entry(symbol)
+    if entry is not None and time.monotonic_ns() - entry[2] < _FETCH_TTL_NS:
+        return Response(content=entry[1], media_type="application/json")
 
-    async with httpx.AsyncClient() as client:
-        data = await fetch_all(symbol, client)
+    data = await fetch_all(symbol, request.app.state.http_client)
     app_state.set_funding_cache(symbol, data)
-    return data
+    return Response(content=app_state.get_cached_funding_bytes(symbol), media_type="application/json")
 
 
 @router.get("/funding-history")
-async def funding_history(symbol: str = Query("BTCUSDT", description="Futures pair, e.g. BTCUSDT")):
+async def funding_history(request: Request, symbol: str = Query("BTCUSDT", description="Futures pair, e.g. BTCUSDT")):
     """Return funding rate history for Binance, Bybit, OKX. Each value: list of {fundingTime (ms), fundingRate}."""
     symbol = _normalize_symbol(symbol)
-    if not symbol or not all(c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-" for c in symbol):
+    if not _SYMBOL_RE.fullmatch(symbol):
         return {"error": "Invalid symbol"}
-    async with httpx.AsyncClient() as client:
-        data = await fetch_all_funding_history(symbol, client)
-    return data
+    data = await fetch_all_funding_history(symbol, request.app.state.http_client)
+    # ETag по содержимому: если история не изменилась, клиент получает 304 без тела
+    body = app_state.encode_json(data)
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
@@ -5,11 +5,11 @@ Start API server in background thread, then open Windows GUI.
 from __future__ import annotations
 
 import os
+import socket
 import sys
 import threading
 import time
 import traceback
-import urllib.request
 
 # В exe без консоли sys.stdout/stderr = None, uvicorn падает на isatty()
 if sys.stdout is None:
@@ -30,26 +30,23 @@ def run_uvicorn():
     global _server_error
     try:
         from config import API_HOST, API_PORT
-        uvicorn.run("main:app", host=API_HOST, port=API_PORT, log_level="warning")
+        uvicorn.run("main:app", host=API_HOST, port=API_PORT, log_level="warning", loop="auto")
     except Exception as e:
         _server_error.append(e)
 
 
 def _wait_for_api(max_wait_sec: float = 10, interval: float = 0.2) -> bool:
-    """Ждём, пока API начнёт отвечать. Возвращает True если готов."""
+    """Ждём, пока API начнёт принимать соединения. Возвращает True если готов.
+    uvicorn открывает порт только после startup приложения, поэтому TCP-подключения достаточно,
+    а запрос к /api/funding здесь лишь запускал бы лишний опрос бирж."""
     from config import API_HOST, API_PORT
-    url = f"http://{API_HOST}:{API_PORT}/api/funding?symbol=BTCUSDT"
     deadline = time.monotonic() + max_wait_sec
     while time.monotonic() < deadline:
         try:
-            req = urllib.request.Request(url)
-            with urllib.request.urlopen(req, timeout=2) as resp:
-                if resp.status == 200:
-                    return True
+            with socket.create_connection((API_HOST, API_PORT), timeout=0.5):
+                return True
         except OSError:
             pass
-        except Exception:
-            pass
         time.sleep(interval)
     return False
 
@@ -1,13 +1,31 @@
 """
 Fetch funding rate data from Binance, Bybit, OKX.
+Per-exchange fetchers expect a normalized symbol (uppercase, no spaces); fetch_all* normalize it once.
+Event loop: the API runs these coroutines under uvicorn with loop="auto", which uses uvloop when it is
+installed (uvicorn[standard] pulls it in everywhere except Windows) and the default asyncio loop otherwise.
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-from typing import Any
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Iterable
 
 import httpx
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
 logger = logging.getLogger(__name__)
 
 BINANCE_PREMIUM = "https://fapi.binance.com/fapi/v1/premiumIndex"
@@ -18,7 +36,98 @@ BYBIT_FUNDING_HISTORY = "https://api.bybit.com/v5/market/funding/history"
 OKX_URL = "https://www.okx.com/api/v5/public/funding-rate"
 OKX_FUNDING_HISTORY = "https://www.okx.com/api/v5/public/funding-rate-history"
 
+# Повтор при 429/5xx и сетевых ошибках: сбой одной биржи не растягивает цикл обновления
+HTTP_RETRIES = 1
+HTTP_BACKOFF_SEC = 0.2
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Общий предел на биржу с учётом повторов: зависшая биржа не задерживает ответ по остальным
+# (GUI ждёт /api/funding 5 с, /api/funding-history — 10 с)
+EXCHANGE_TIMEOUT_SEC = 4.0
+HISTORY_TIMEOUT_SEC = 8.0
+# _get укладывается в бюджет вызывающего с запасом, чтобы внешний wait_for не обрывал последнюю попытку.
+# Первая попытка получает большую часть бюджета (холодное TLS/HTTP2-соединение на медленном канале),
+# повтор — остаток. httpx.Timeout ограничивает каждую фазу (connect, read, ...), а не запрос целиком,
+# поэтому попытку целиком ограничивает asyncio.wait_for.
+HTTP_HEADROOM_SEC = 0.3
+HTTP_FIRST_ATTEMPT_SHARE = 0.65
+
+_HOUR_MS = 3600 * 1000
+# Метки времени меньше этого значения пришли в секундах, а не в миллисекундах
+_MS_TS_MIN = 1_000_000_000_000
+
+
+def create_client() -> httpx.AsyncClient:
+    """Общий клиент для запросов к биржам (fetch_all, fetch_all_funding_history и др.).
+    HTTP/2: запросы к одной бирже идут мультиплексом по одному TLS-соединению; пул держит соединения тёплыми.
+    Accept-Encoding (gzip, br) httpx выставляет сам — br включается при установленном brotli (requirements)."""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60),
+    )
+
+
+async def _get(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, Any] | None = None,
+    budget: float = EXCHANGE_TIMEOUT_SEC,
+) -> httpx.Response:
+    """GET, уложенный в budget секунд (за вычетом HTTP_HEADROOM_SEC); при 429/5xx, сетевых ошибках и таймауте
+    первой попытки — до HTTP_RETRIES повторов с экспоненциальной паузой в пределах оставшегося времени."""
+    deadline = time.monotonic() + budget - HTTP_HEADROOM_SEC
+    for attempt in range(HTTP_RETRIES):
+        try:
+            r = await _get_once(client, url, params, (deadline - time.monotonic()) * HTTP_FIRST_ATTEMPT_SHARE)
+            if r.status_code not in _RETRY_STATUSES:
+                return r
+        except httpx.TransportError as e:
+            logger.debug("GET %s failed (attempt %d): %r", url, attempt + 1, e)
+        await asyncio.sleep(HTTP_BACKOFF_SEC * 2 ** attempt)
+    return await _get_once(client, url, params, deadline - time.monotonic())
+
+
+async def _get_once(client: httpx.AsyncClient, url: str, params: dict[str, Any] | None, limit: float) -> httpx.Response:
+    limit = max(limit, 0.0)
+    try:
+        return await asyncio.wait_for(client.get(url, params=params, timeout=limit), limit)
+    except asyncio.TimeoutError:
+        # Как httpx-таймаут: вызывающие обрабатывают его вместе с прочими ожидаемыми сетевыми сбоями
+        raise httpx.TimeoutException(f"GET {url}: no response within {limit:.1f}s") from None
+
+
+def _loads(r: httpx.Response) -> Any:
+    """Разобрать JSON-ответ: orjson по сырым байтам, если установлен, иначе r.json()."""
+    if HAS_ORJSON:
+        return orjson.loads(r.content)
+    return r.json()
+
+
+def _to_float(x: Any) -> float | None:
+    """Ставка из ответа биржи (строка) в число; None, если разобрать нельзя (в JSON — null, не NaN)."""
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return None
+
+
+def _funding_row(exchange: str, symbol: str, funding_rate: float | None, next_funding_time_ms: int, interval: str) -> dict[str, Any]:
+    """Строка текущего фандинга в формате ответа /api/funding (обычный dict — он же уходит в JSON)."""
+    return {
+        "exchange": exchange,
+        "symbol": symbol,
+        "fundingRate": funding_rate,
+        "nextFundingTimeMs": next_funding_time_ms,
+        "interval": interval,
+    }
+
+
+def _error_row(exchange: str, error: str) -> dict[str, Any]:
+    """Строка для биржи, по которой данных нет."""
+    return {"exchange": exchange, "error": error, "fundingRate": None, "nextFundingTimeMs": 0, "interval": ""}
+
 
+@functools.lru_cache(maxsize=1024)
 def _symbol_okx(symbol: str) -> str:
     """Convert BTCUSDT -> BTC-USDT-SWAP for OKX."""
     if "-" in symbol:
@@ -30,54 +139,177 @@ def _symbol_okx(symbol: str) -> str:
     return f"{symbol}-SWAP"
 
 
-async def _binance_interval(symbol: str, client: httpx.AsyncClient) -> str:
-    """Получить интервал фандинга по символу (fundingInfo). По умолчанию 8h."""
+# Интервал фандинга меняется редко: один запрос fundingInfo заполняет кэш сразу для всех символов
+INTERVAL_CACHE_TTL_SEC = 3600
+_binance_intervals: dict[str, str] = {}
+_binance_intervals_expiry = 0.0
+# Обновление идёт в фоне одной задачей на всех; fetch_binance ждёт его не дольше INTERVAL_WAIT_SEC,
+# а затем отдаёт прежний (или 8h) интервал — медленный fundingInfo не задерживает строку Binance
+INTERVAL_WAIT_SEC = 1.0
+# После неудачного обновления повторяем не раньше чем через INTERVAL_RETRY_SEC
+INTERVAL_RETRY_SEC = 60
+_binance_intervals_task: asyncio.Task[None] | None = None
+
+
+async def _refresh_binance_intervals(client: httpx.AsyncClient) -> None:
+    """Скачать fundingInfo (не дольше HISTORY_TIMEOUT_SEC) и заменить кэш интервалов всех символов."""
+    global _binance_intervals, _binance_intervals_expiry
     try:
-        r = await client.get(BINANCE_FUNDING_INFO, timeout=10.0)
+        if HAS_IJSON:
+            _binance_intervals = await asyncio.wait_for(_stream_binance_intervals(client), HISTORY_TIMEOUT_SEC)
+        else:
+            r = await _get(client, BINANCE_FUNDING_INFO, budget=HISTORY_TIMEOUT_SEC)
+            r.raise_for_status()
+            lst = _loads(r)
+            if isinstance(lst, list):
+                _binance_intervals = {x["symbol"]: f"{x.get('fundingIntervalHours', '8')}h" for x in lst if x.get("symbol")}
+        _binance_intervals_expiry = time.monotonic() + INTERVAL_CACHE_TTL_SEC
+    except Exception as e:
+        logger.debug("Binance fundingInfo failed: %r", e)
+        _binance_intervals_expiry = time.monotonic() + INTERVAL_RETRY_SEC
+
+
+async def _stream_binance_intervals(client: httpx.AsyncClient) -> dict[str, str]:
+    """Разобрать fundingInfo потоково (ijson): весь список целиком в памяти не держим."""
+    intervals: dict[str, str] = {}
+    items = ijson.sendable_list()
+    parser = ijson.items_coro(items, "item")
+    async with client.stream("GET", BINANCE_FUNDING_INFO, timeout=HISTORY_TIMEOUT_SEC) as r:
         r.raise_for_status()
-        lst = r.json()
-        if isinstance(lst, list):
-            for x in lst:
-                if x.get("symbol") == symbol.upper():
-                    h = x.get("fundingIntervalHours", "8")
-                    return f"{h}h"
-    except Exception:
+        async for chunk in r.aiter_bytes():
+            parser.send(chunk)
+            _take_intervals(items, intervals)
+    parser.close()  # дописывает последние объекты, если поток закончился на границе
+    _take_intervals(items, intervals)
+    return intervals
+
+
+def _take_intervals(items: list[dict[str, Any]], intervals: dict[str, str]) -> None:
+    for x in items:
+        if x.get("symbol"):
+            intervals[x["symbol"]] = f"{x.get('fundingIntervalHours', '8')}h"
+    del items[:]
+
+
+async def _ensure_binance_intervals(client: httpx.AsyncClient) -> None:
+    """Если кэш интервалов устарел — запустить (или дождаться уже идущее) обновление, но не дольше INTERVAL_WAIT_SEC."""
+    global _binance_intervals_task
+    if time.monotonic() < _binance_intervals_expiry:
+        return
+    if _binance_intervals_task is None or _binance_intervals_task.done():
+        _binance_intervals_task = asyncio.create_task(_refresh_binance_intervals(client))
+    try:
+        # shield: по таймауту ожидания обновление продолжается в фоне
+        await asyncio.wait_for(asyncio.shield(_binance_intervals_task), INTERVAL_WAIT_SEC)
+    except asyncio.TimeoutError:
         pass
-    return "8h"
 
 
+async def _binance_interval(symbol: str, client: httpx.AsyncClient) -> str:
+    """Получить интервал фандинга по символу (fundingInfo). По умолчанию 8h."""
+    await _ensure_binance_intervals(client)
+    return _binance_intervals.get(symbol, "8h")
+
+
+# Одновременные запросы одной биржи по одному символу ждут общую задачу, а не дублируют HTTP-запрос
+_inflight: dict[tuple[str, str], asyncio.Task[Any]] = {}
+
+_Fetcher = Callable[[str, httpx.AsyncClient], Awaitable[Any]]
+
+
+def _coalesced(exchange: str) -> Callable[[_Fetcher], _Fetcher]:
+    """Декоратор: пока запрос (exchange, symbol) в полёте, остальные вызовы получают его результат."""
+    def decorate(fetch: _Fetcher) -> _Fetcher:
+        @functools.wraps(fetch)
+        async def wrapper(symbol: str, client: httpx.AsyncClient) -> Any:
+            key = (exchange, symbol)
+            task = _inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(fetch(symbol, client))
+                _inflight[key] = task
+                task.add_done_callback(lambda _: _inflight.pop(key, None))
+            # shield: таймаут/отмена одного вызова не отменяет запрос для остальных
+            return await asyncio.shield(task)
+        return wrapper
+    return decorate
+
+
+@_coalesced("binance")
 async def fetch_binance(symbol: str, client: httpx.AsyncClient) -> dict[str, Any] | None:
     """Fetch funding from Binance. Symbol: BTCUSDT."""
     try:
-        r = await client.get(BINANCE_PREMIUM, params={"symbol": symbol.upper()}, timeout=10.0)
+        # premiumIndex и fundingInfo независимы — запрашиваем параллельно, а не по очереди
+        r, interval = await asyncio.gather(
+            _get(client, BINANCE_PREMIUM, params={"symbol": symbol}),
+            _binance_interval(symbol, client),
+            return_exceptions=True,
+        )
+        if isinstance(r, BaseException):
+            raise r
+        if isinstance(interval, BaseException):
+            interval = "8h"
         r.raise_for_status()
-        data = r.json()
+        data = _loads(r)
         if isinstance(data, list):
-            data = next((x for x in data if x.get("symbol") == symbol.upper()), data[0] if data else {})
+            data = next((x for x in data if x.get("symbol") == symbol), data[0] if data else {})
         next_ts_ms = int(data.get("nextFundingTime", 0))
-        interval = await _binance_interval(symbol, client)
+        return _funding_row("binance", data.get("symbol", symbol), _to_float(data.get("lastFundingRate")), next_ts_ms, interval)
+    except (httpx.HTTPError, ValueError) as e:
+        # Ожидаемые сбои (сеть, 4xx/5xx, битый JSON) — без трассировки стека
+        logger.warning("Binance fetch failed: %s", e)
+        return None
+    except Exception:
+        logger.exception("Binance fetch failed")
+        return None
+
+
+async def fetch_binance_all(symbols: Iterable[str], client: httpx.AsyncClient) -> dict[str, dict[str, Any]]:
+    """Фандинг Binance сразу по нескольким символам: premiumIndex без symbol отдаёт все пары одним ответом,
+    интервалы берутся из общего кэша fundingInfo — на весь набор 1–2 запроса вместо N вызовов fetch_binance.
+    Возвращает { symbol: строка как у fetch_binance } только для найденных символов."""
+    wanted = {s.upper().replace(" ", "") for s in symbols}
+    try:
+        r, _ = await asyncio.gather(
+            _get(client, BINANCE_PREMIUM),
+            _ensure_binance_intervals(client),
+            return_exceptions=True,
+        )
+        if isinstance(r, BaseException):
+            raise r
+        r.raise_for_status()
+        data = _loads(r)
+        if not isinstance(data, list):
+            return {}
         return {
-            "exchange": "binance",
-            "symbol": data.get("symbol", symbol),
-            "fundingRate": str(data.get("lastFundingRate", "")),
-            "nextFundingTimeMs": next_ts_ms,
-            "interval": interval,
+            x["symbol"]: _funding_row(
+                "binance",
+                x["symbol"],
+                _to_float(x.get("lastFundingRate")),
+                int(x.get("nextFundingTime", 0)),
+                _binance_intervals.get(x["symbol"], "8h"),
+            )
+            for x in data
+            if x.get("symbol") in wanted
         }
-    except Exception as e:
-        logger.exception("Binance fetch failed: %s", e)
-        return None
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning("Binance batch fetch failed: %s", e)
+        return {}
+    except Exception:
+        logger.exception("Binance batch fetch failed")
+        return {}
 
 
+@_coalesced("bybit")
 async def fetch_bybit(symbol: str, client: httpx.AsyncClient) -> dict[str, Any] | None:
     """Fetch funding from Bybit. Symbol: BTCUSDT."""
     try:
-        r = await client.get(
+        r = await _get(
+            client,
             BYBIT_URL,
-            params={"category": "linear", "symbol": symbol.upper()},
-            timeout=10.0,
+            params={"category": "linear", "symbol": symbol},
         )
         r.raise_for_status()
-        out = r.json()
+        out = _loads(r)
         if out.get("retCode") != 0:
             return None
         lst = out.get("result", {}).get("list") or []
@@ -87,29 +319,30 @@ async def fetch_bybit(symbol: str, client: httpx.AsyncClient) -> dict[str, Any]
         next_ts = item.get("nextFundingTime") or "0"
         next_ts_ms = int(next_ts) if next_ts else 0
         interval_h = item.get("fundingIntervalHour") or "8"
-        return {
-            "exchange": "bybit",
-            "symbol": item.get("symbol", symbol),
-            "fundingRate": str(item.get("fundingRate", "")),
-            "nextFundingTimeMs": next_ts_ms,
-            "interval": f"{interval_h}h",
-        }
-    except Exception as e:
-        logger.exception("Bybit fetch failed: %s", e)
+        return _funding_row("bybit", item.get("symbol", symbol), _to_float(item.get("fundingRate")), next_ts_ms, f"{interval_h}h")
+    except (httpx.HTTPError, ValueError) as e:
+        # Ожидаемые сбои (сеть, 4xx/5xx, битый JSON) — без трассировки стека
+        logger.warning("Bybit fetch failed: %s", e)
+        return None
+    except Exception:
+        logger.exception("Bybit fetch failed")
         return None
 
 
+def _to_ms(ts: int) -> int:
+    """Метка времени биржи в мс: значения меньше 1e12 пришли в секундах."""
+    return ts * 1000 if 0 < ts < _MS_TS_MIN else ts
+
+
 def _okx_ts_ms(raw: str) -> int:
     """OKX timestamp: в ответе в миллисекундах; если < 1e12 — считаем секунды."""
     if not raw:
         return 0
     try:
         ts = int(raw)
-        if 0 < ts < 1_000_000_000_000:
-            return ts * 1000
-        return ts
     except (ValueError, TypeError):
         return 0
+    return _to_ms(ts)
 
 
 def _okx_interval_hours(item: dict[str, Any]) -> int:
@@ -118,12 +351,12 @@ def _okx_interval_hours(item: dict[str, Any]) -> int:
         next_ts = _okx_ts_ms(item.get("nextFundingTime") or "0")
         curr_ts = _okx_ts_ms(item.get("fundingTime") or "0")
         if curr_ts > 0 and next_ts > curr_ts:
-            h = round((next_ts - curr_ts) / 3600000)
+            h = round((next_ts - curr_ts) / _HOUR_MS)
             if 1 <= h <= 24:
                 return h
         prev_ts = _okx_ts_ms(item.get("prevFundingTime") or "0")
         if prev_ts > 0 and next_ts > prev_ts:
-            h = round((next_ts - prev_ts) / 3600000)
+            h = round((next_ts - prev_ts) / _HOUR_MS)
             if 1 <= h <= 24:
                 return h
     except (ValueError, TypeError):
@@ -131,17 +364,18 @@ def _okx_interval_hours(item: dict[str, Any]) -> int:
     return 8
 
 
+@_coalesced("okx")
 async def fetch_okx(symbol: str, client: httpx.AsyncClient) -> dict[str, Any] | None:
     """Fetch funding from OKX. Symbol: BTCUSDT -> instId BTC-USDT-SWAP."""
     inst_id = _symbol_okx(symbol)
     try:
-        r = await client.get(
+        r = await _get(
+            client,
             OKX_URL,
             params={"instId": inst_id},
-            timeout=10.0,
         )
         r.raise_for_status()
-        out = r.json()
+        out = _loads(r)
         if out.get("code") != "0":
             return None
         data_list = out.get("data") or []
@@ -151,37 +385,65 @@ async def fetch_okx(symbol: str, client: httpx.AsyncClient) -> dict[str, Any] |
         next_ts_ms = _okx_ts_ms(item.get("nextFundingTime") or "0")
         interval_h = _okx_interval_hours(item)
         # На OKX nextFundingTime по факту даёт время + интервал; вычитаем интервал для корректного Time to Next
-        interval_ms = interval_h * 3600 * 1000
+        interval_ms = interval_h * _HOUR_MS
         if next_ts_ms > interval_ms:
             next_ts_ms -= interval_ms
-        return {
-            "exchange": "okx",
-            "symbol": item.get("instId", inst_id),
-            "fundingRate": str(item.get("fundingRate") or item.get("settFundingRate", "")),
-            "nextFundingTimeMs": next_ts_ms,
-            "interval": f"{interval_h}h",
-        }
-    except Exception as e:
-        logger.exception("OKX fetch failed: %s", e)
+        return _funding_row(
+            "okx",
+            item.get("instId", inst_id),
+            _to_float(item.get("fundingRate") or item.get("settFundingRate")),
+            next_ts_ms,
+            f"{interval_h}h",
+        )
+    except (httpx.HTTPError, ValueError) as e:
+        # Ожидаемые сбои (сеть, 4xx/5xx, битый JSON) — без трассировки стека
+        logger.warning("OKX fetch failed: %s", e)
+        return None
+    except Exception:
+        logger.exception("OKX fetch failed")
         return None
 
 
 FUNDING_HISTORY_LIMIT = 50
 
+# История меняется раз в интервал фандинга: повторные запросы в пределах TTL отдаём из памяти.
+# Размер ограничен числом символов, поэтому устаревшие записи не вычищаем — только перезаписываем.
+HISTORY_CACHE_TTL_SEC = 60
+_hist_cache: dict[tuple[str, str], tuple[float, list[dict[str, Any]]]] = {}
+
+
+def _hist_cached(exchange: str, key: str) -> list[dict[str, Any]] | None:
+    entry = _hist_cache.get((exchange, key))
+    if entry is not None and time.monotonic() - entry[0] < HISTORY_CACHE_TTL_SEC:
+        return entry[1]
+    return None
+
+
+def _hist_store(exchange: str, key: str, result: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Запомнить непустую историю (пустой список — скорее сбой биржи) и вернуть её."""
+    if result:
+        _hist_cache[(exchange, key)] = (time.monotonic(), result)
+    return result
+
 
 async def fetch_funding_history_binance(symbol: str, client: httpx.AsyncClient, limit: int = FUNDING_HISTORY_LIMIT) -> list[dict[str, Any]]:
     """История фандингов Binance: список {fundingTime (ms), fundingRate}."""
+    key = f"{symbol}:{limit}"
+    cached = _hist_cached("binance", key)
+    if cached is not None:
+        return cached
     try:
-        r = await client.get(
+        r = await _get(
+            client,
             BINANCE_FUNDING_RATE_HISTORY,
-            params={"symbol": symbol.upper(), "limit": limit},
-            timeout=10.0,
+            params={"symbol": symbol, "limit": limit},
+            budget=HISTORY_TIMEOUT_SEC,
         )
         r.raise_for_status()
-        data = r.json()
+        data = _loads(r)
         if not isinstance(data, list):
             return []
-        return [{"fundingTime": int(x.get("fundingTime", 0)), "fundingRate": str(x.get("fundingRate", ""))} for x in data]
+        return _hist_store("binance", key, [{"fundingTime": int(x.get("fundingTime", 0)), "fundingRate": _to_float(x.get("fundingRate"))} for x in data])
     except Exception as e:
         logger.debug("Binance funding history failed: %s", e)
         return []
@@ -189,25 +451,30 @@ async def fetch_funding_history_binance(symbol: str, client: httpx.AsyncClient,
 
 async def fetch_funding_history_bybit(symbol: str, client: httpx.AsyncClient, limit: int = FUNDING_HISTORY_LIMIT) -> list[dict[str, Any]]:
     """История фандингов Bybit: список {fundingTime (ms), fundingRate}."""
+    key = f"{symbol}:{limit}"
+    cached = _hist_cached("bybit", key)
+    if cached is not None:
+        return cached
     try:
-        r = await client.get(
+        r = await _get(
+            client,
             BYBIT_FUNDING_HISTORY,
-            params={"category": "linear", "symbol": symbol.upper(), "limit": limit},
-            timeout=10.0,
+            params={"category": "linear", "symbol": symbol, "limit": limit},
+            budget=HISTORY_TIMEOUT_SEC,
         )
         r.raise_for_status()
-        out = r.json()
+        out = _loads(r)
         if out.get("retCode") != 0:
             return []
         lst = out.get("result", {}).get("list") or []
-        result = []
-        for x in lst:
-            ft = x.get("fundingRateTimestamp") or x.get("fundingRateTime") or "0"
-            ts_ms = int(ft) if ft else 0
-            if 0 < ts_ms < 1_000_000_000_000:
-                ts_ms *= 1000
-            result.append({"fundingTime": ts_ms, "fundingRate": str(x.get("fundingRate", ""))})
-        return result
+        result = [
+            {
+                "fundingTime": _to_ms(int(x.get("fundingRateTimestamp") or x.get("fundingRateTime") or 0)),
+                "fundingRate": _to_float(x.get("fundingRate")),
+            }
+            for x in lst
+        ]
+        return _hist_store("bybit", key, result)
     except Exception as e:
         logger.debug("Bybit funding history failed: %s", e)
         return []
@@ -216,42 +483,58 @@ async def fetch_funding_history_bybit(symbol: str, client: httpx.AsyncClient, li
 async def fetch_funding_history_okx(symbol: str, client: httpx.AsyncClient, limit: int = FUNDING_HISTORY_LIMIT) -> list[dict[str, Any]]:
     """История фандингов OKX: список {fundingTime (ms), fundingRate}."""
     inst_id = _symbol_okx(symbol)
+    key = f"{inst_id}:{limit}"
+    cached = _hist_cached("okx", key)
+    if cached is not None:
+        return cached
     try:
-        r = await client.get(
+        r = await _get(
+            client,
             OKX_FUNDING_HISTORY,
             params={"instId": inst_id, "limit": str(limit)},
-            timeout=10.0,
+            budget=HISTORY_TIMEOUT_SEC,
         )
         r.raise_for_status()
-        out = r.json()
+        out = _loads(r)
         if out.get("code") != "0":
             return []
         data_list = out.get("data") or []
-        result = []
-        for x in data_list:
-            ts_ms = _okx_ts_ms(x.get("fundingTime") or "0")
-            result.append({"fundingTime": ts_ms, "fundingRate": str(x.get("fundingRate", ""))})
-        return result
+        result = [
+            {"fundingTime": _okx_ts_ms(x.get("fundingTime") or "0"), "fundingRate": _to_float(x.get("fundingRate"))}
+            for x in data_list
+        ]
+        return _hist_store("okx", key, result)
     except Exception as e:
         logger.debug("OKX funding history failed: %s", e)
         return []
 
 
-async def fetch_all_funding_history(symbol: str, client: httpx.AsyncClient) -> dict[str, list[dict[str, Any]]]:
-    """История фандингов по всем биржам. Ключи: binance, bybit, okx."""
-    import asyncio
-    symbol = symbol.upper().replace(" ", "")
-    tasks = [
-        fetch_funding_history_binance(symbol, client),
-        fetch_funding_history_bybit(symbol, client),
-        fetch_funding_history_okx(symbol, client),
+# Порядок бирж в _current_tasks / _history_tasks и в результатах gather
+_EXCHANGE_NAMES: tuple[str, ...] = ("binance", "bybit", "okx")
+
+
+def _history_tasks(symbol: str, client: httpx.AsyncClient) -> list[Coroutine[Any, Any, Any]]:
+    return [
+        asyncio.wait_for(fetch_funding_history_binance(symbol, client), HISTORY_TIMEOUT_SEC),
+        asyncio.wait_for(fetch_funding_history_bybit(symbol, client), HISTORY_TIMEOUT_SEC),
+        asyncio.wait_for(fetch_funding_history_okx(symbol, client), HISTORY_TIMEOUT_SEC),
+    ]
+
+
+def _current_tasks(symbol: str, client: httpx.AsyncClient) -> list[Coroutine[Any, Any, Any]]:
+    return [
+        asyncio.wait_for(fetch_binance(symbol, client), EXCHANGE_TIMEOUT_SEC),
+        asyncio.wait_for(fetch_bybit(symbol, client), EXCHANGE_TIMEOUT_SEC),
+        asyncio.wait_for(fetch_okx(symbol, client), EXCHANGE_TIMEOUT_SEC),
     ]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _history_results(results: list[Any]) -> dict[str, list[dict[str, Any]]]:
+    """Результаты gather по истории (binance, bybit, okx) -> { биржа: список }; сбой биржи — пустой список."""
     out = {}
-    for i, name in enumerate(["binance", "bybit", "okx"]):
-        r = results[i]
+    for name, r in zip(_EXCHANGE_NAMES, results):
         if isinstance(r, Exception):
-            logger.warning("%s history failed: %s", name, r)
+            logger.warning("%s history failed: %r", name, r)
             out[name] = []
         elif isinstance(r, list):
             out[name] = r
@@ -260,25 +543,83 @@ async def fetch_all_funding_history(symbol: str, client: httpx.AsyncClient) -> d
     return out
 
 
-async def fetch_all(symbol: str, client: httpx.AsyncClient) -> dict[str, dict[str, Any]]:
-    """Fetch from all three exchanges. Symbol in uppercase Latin, e.g. BTCUSDT."""
-    import asyncio
-
-    symbol = symbol.upper().replace(" ", "")
-    tasks = [
-        fetch_binance(symbol, client),
-        fetch_bybit(symbol, client),
-        fetch_okx(symbol, client),
-    ]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+def _current_results(results: list[Any]) -> dict[str, dict[str, Any]]:
+    """Результаты gather по текущему фандингу (binance, bybit, okx) -> { биржа: строка }; сбой — строка с error."""
     out = {}
-    for i, name in enumerate(["binance", "bybit", "okx"]):
-        r = results[i]
+    for name, r in zip(_EXCHANGE_NAMES, results):
         if isinstance(r, Exception):
-            logger.warning("%s failed: %s", name, r)
-            out[name] = {"exchange": name, "error": str(r), "fundingRate": "", "nextFundingTimeMs": 0, "interval": ""}
+            logger.warning("%s failed: %r", name, r)
+            out[name] = _error_row(name, str(r) or type(r).__name__)
         elif r:
             out[name] = r
         else:
-            out[name] = {"exchange": name, "error": "No data", "fundingRate": "", "nextFundingTimeMs": 0, "interval": ""}
+            out[name] = _error_row(name, "No data")
     return out
+
+
+async def fetch_all_funding_history(symbol: str, client: httpx.AsyncClient) -> dict[str, list[dict[str, Any]]]:
+    """История фандингов по всем биржам. Ключи: binance, bybit, okx. client — из create_client()."""
+    symbol = symbol.upper().replace(" ", "")
+    results = await asyncio.gather(*_history_tasks(symbol, client), return_exceptions=True)
+    return _history_results(results)
+
+
+async def fetch_all(symbol: str, client: httpx.AsyncClient) -> dict[str, dict[str, Any]]:
+    """Fetch from all three exchanges. Symbol in uppercase Latin, e.g. BTCUSDT. Pass a client from create_client()."""
+    symbol = symbol.upper().replace(" ", "")
+    results = await asyncio.gather(*_current_tasks(symbol, client), return_exceptions=True)
+    return _current_results(results)
+
+
+async def fetch_all_combined(symbol: str, client: httpx.AsyncClient) -> dict[str, dict[str, Any]]:
+    """Текущий фандинг и история по всем биржам одним gather из шести запросов.
+    Возвращает {"current": <как fetch_all>, "history": <как fetch_all_funding_history>}."""
+    symbol = symbol.upper().replace(" ", "")
+    results = await asyncio.gather(
+        *_current_tasks(symbol, client),
+        *_history_tasks(symbol, client),
+        return_exceptions=True,
+    )
+    return {"current": _current_results(results[:3]), "history": _history_results(results[3:])}
+
+
+# Stale-while-revalidate для частого опроса: свежий ответ отдаём сразу, устаревший — тоже сразу,
+# но с обновлением в фоне; только при отсутствии данных (или совсем старых) ждём биржи
+SWR_FRESH_SEC = 2.0
+SWR_STALE_SEC = 30.0
+_swr_cache: dict[str, tuple[float, dict[str, dict[str, Any]]]] = {}
+_swr_inflight: dict[str, asyncio.Task[dict[str, dict[str, Any]]]] = {}
+
+
+async def _swr_refresh(symbol: str, client: httpx.AsyncClient) -> dict[str, dict[str, Any]]:
+    try:
+        data = await fetch_all(symbol, client)
+        _swr_cache[symbol] = (time.monotonic(), data)
+        return data
+    finally:
+        _swr_inflight.pop(symbol, None)
+
+
+def _swr_task(symbol: str, client: httpx.AsyncClient) -> asyncio.Task[dict[str, dict[str, Any]]]:
+    """Текущее фоновое обновление символа или новое, если его нет: одно на символ."""
+    task = _swr_inflight.get(symbol)
+    if task is None:
+        task = asyncio.create_task(_swr_refresh(symbol, client))
+        _swr_inflight[symbol] = task
+    return task
+
+
+async def fetch_all_cached(symbol: str, client: httpx.AsyncClient) -> dict[str, dict[str, Any]]:
+    """fetch_all с кэшем stale-while-revalidate: моложе SWR_FRESH_SEC — из кэша; до SWR_STALE_SEC — из кэша
+    с обновлением в фоне; иначе ждём обновления."""
+    symbol = symbol.upper().replace(" ", "")
+    entry = _swr_cache.get(symbol)
+    if entry is not None:
+        age = time.monotonic() - entry[0]
+        if age < SWR_FRESH_SEC:
+            return entry[1]
+        if age < SWR_STALE_SEC:
+            _swr_task(symbol, client)
+            return entry[1]
+    # shield: отмена одного ожидающего не отменяет общее обновление для остальных
+    return await asyncio.shield(_swr_task(symbol, client))
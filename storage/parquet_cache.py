@@ -3,61 +3,133 @@ Parquet cache for funding data. Cleans up each funding period to avoid history b
 """
 from __future__ import annotations
 
+import atexit
 import os
+import threading
 import time
 from pathlib import Path
 
-from config import PARQUET_DIR
+from config import FUNDING_INTERVAL_HOURS, PARQUET_DIR
 
 try:
-    import pandas as pd
-    HAS_PANDAS = True
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_ARROW = True
 except ImportError:
-    HAS_PANDAS = False
+    HAS_ARROW = False
 
-# One file per period; we overwrite to keep only current period
-CACHE_FILE = "funding_cache.parquet"
+if HAS_ARROW:
+    # Low-cardinality strings as dictionaries; fundingRate as a number instead of a repeated string
+    SCHEMA = pa.schema([
+        ("ts", pa.int64()),
+        ("exchange", pa.dictionary(pa.int8(), pa.string())),
+        ("symbol", pa.dictionary(pa.int16(), pa.string())),
+        ("fundingRate", pa.float64()),
+        ("nextFundingTimeMs", pa.int64()),
+        ("interval", pa.dictionary(pa.int8(), pa.string())),
+    ])
+
+# Dataset directory: each flush is its own complete part file, so every file on disk is always readable
+# (pq.read_table(<dir>)) and a restart only adds parts instead of truncating earlier data.
+CACHE_DIR = "funding_cache"
+PART_PREFIX = "part-"
+# Keep only the current funding period: older parts are removed on each flush
+WINDOW_MS = FUNDING_INTERVAL_HOURS * 3600 * 1000
+
+# Rows are buffered and written as one part: fewer writes, better compression.
+# The refresh loop adds 3 rows every 15 s (~180 rows per 15 min), so a funding window holds ~32 parts
+# instead of hundreds of tiny ones; buffered rows are also flushed at exit (atexit below).
+FLUSH_ROWS = 1024
+FLUSH_INTERVAL_SEC = 15 * 60
+_buffer: list[dict[str, object]] = []
+_buffer_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+_DIR_READY = False
 
 
 def _path() -> Path:
-    Path(PARQUET_DIR).mkdir(parents=True, exist_ok=True)
-    return Path(PARQUET_DIR) / CACHE_FILE
+    global _DIR_READY
+    path = Path(PARQUET_DIR) / CACHE_DIR
+    if not _DIR_READY:
+        # Create the directory once; cleanup_old() removes only part files, not the directory
+        path.mkdir(parents=True, exist_ok=True)
+        _DIR_READY = True
+    return path
 
 
-def write_row(exchange: str, symbol: str, funding_rate: str, next_funding_time_ms: int, interval: str) -> None:
-    if not HAS_PANDAS:
+def write_row(exchange: str, symbol: str, funding_rate: float | None, next_funding_time_ms: int, interval: str) -> None:
+    if not HAS_ARROW:
         return
-    path = _path()
     row = {
-        "ts": int(time.time() * 1000),
+        "ts": time.time_ns() // 1_000_000,
         "exchange": exchange,
         "symbol": symbol,
         "fundingRate": funding_rate,
         "nextFundingTimeMs": next_funding_time_ms,
         "interval": interval,
     }
-    df = pd.DataFrame([row])
-    if path.exists():
+    with _buffer_lock:
+        _buffer.append(row)
+        if len(_buffer) >= FLUSH_ROWS or time.monotonic() - _last_flush > FLUSH_INTERVAL_SEC:
+            _flush_locked()
+
+
+def _flush_locked() -> None:
+    """Write buffered rows as a new part file and drop parts older than WINDOW_MS (caller holds _buffer_lock)."""
+    global _last_flush
+    _last_flush = time.monotonic()
+    if not _buffer:
+        return
+    table = pa.Table.from_pylist(_buffer, schema=SCHEMA)
+    _buffer.clear()
+    directory = _path()
+    now_ns = time.time_ns()
+    name = f"{PART_PREFIX}{now_ns}.parquet"
+    # Write under a hidden name, then rename: readers never see a partially written part
+    tmp = directory / f".{name}.tmp"
+    pq.write_table(table, tmp, use_dictionary=True, compression="zstd")
+    os.replace(tmp, directory / name)
+    _prune(directory, now_ns // 1_000_000 - WINDOW_MS)
+
+
+def _prune(directory: Path, before_ms: int) -> None:
+    """Remove part files written before before_ms."""
+    for part in directory.glob(f"{PART_PREFIX}*.parquet"):
         try:
-            existing = pd.read_parquet(path)
-            # Keep only rows from current 8h window (next funding in future or recent)
-            now_ms = int(time.time() * 1000)
-            window_ms = 8 * 3600 * 1000
-            existing = existing[
-                (existing["nextFundingTimeMs"] > now_ms - window_ms)
-                | (existing["ts"] > now_ms - window_ms)
-            ]
-            df = pd.concat([existing, df], ignore_index=True)
-        except Exception:
-            pass
-    df.to_parquet(path, index=False)
+            written_ms = int(part.stem[len(PART_PREFIX):]) // 1_000_000
+        except ValueError:
+            continue
+        if written_ms < before_ms:
+            try:
+                part.unlink()
+            except OSError:
+                pass
+
+
+def flush() -> None:
+    """Write out buffered rows now."""
+    if not HAS_ARROW:
+        return
+    with _buffer_lock:
+        _flush_locked()
+
+
+def close() -> None:
+    """Flush buffered rows (call on shutdown)."""
+    flush()
+
+
+# run_gui.py runs uvicorn in a daemon thread, so the lifespan shutdown never runs there:
+# flush the buffer at interpreter exit as well
+atexit.register(close)
 
 
 def cleanup_old() -> None:
-    """Remove parquet file each funding period so we don't accumulate history."""
-    path = _path()
-    if path.exists():
-        try:
-            path.unlink()
-        except OSError:
-            pass
+    """Remove parquet parts each funding period so we don't accumulate history."""
+    if not HAS_ARROW:
+        return
+    with _buffer_lock:
+        _buffer.clear()
+        _prune(_path(), time.time_ns() // 1_000_000 + 1)